@@ -0,0 +1,366 @@
+"""
+Benchmarks for the BoardModel hot paths and the board drawing code.
+
+    python pokemon_bench.py run [--sizes 10 50] [--densities 0.15]
+    python pokemon_bench.py compare [--threshold 0.1]
+
+Boards are seeded from their grid size and density, so every run times the
+same boards. Each run is appended to a JSON history file; compare checks the
+latest run against the median of the runs before it (or one --baseline run)
+and exits with status 1 when a case got slower than the threshold allows.
+
+The draw cases run the real tkinter Canvas wrappers against FakeTk, which
+stands in for the Tcl interpreter, so no display is needed.
+"""
+
+import argparse,json,platform,random,statistics,sys,time
+
+from pokemon_model import BoardModel, UNEXPOSED, FLAG
+from pokemon_engine import game_state
+
+GRID_SIZES = (10, 50, 200, 1000)
+DENSITIES = (0.15, 0.25)
+# Drawing a 1000 x 1000 board means millions of canvas items, skip it by default.
+DRAW_MAX_GRID = 200
+HISTORY_FILE = 'bench_history.json'
+# Cases faster than this are too noisy to gate on.
+NOISE_FLOOR = 1e-3
+# The number of earlier runs whose median compare uses as the baseline.
+BASELINE_RUNS = 5
+
+
+class FakeTk:
+    '''
+    Stand-in for the Tcl interpreter behind a tkinter widget.
+
+    Every command succeeds and canvas item ids are handed out like Tk does.
+    '''
+    def __init__(self):
+        self._next_item = 0
+
+    def call(self, *args):
+        if len(args) == 1 and isinstance(args[0], tuple):
+            args = args[0]
+        if len(args) > 1 and args[1] == 'create':
+            self._next_item += 1
+            return self._next_item
+        return ''
+
+    def getint(self, value):
+        return int(value)
+
+    def splitlist(self, value):
+        return tuple(value) if isinstance(value, tuple) else ()
+
+    def createcommand(self, name, func):
+        pass
+
+    def deletecommand(self, name):
+        pass
+
+
+class FakeRoot:
+    '''
+    Just enough of a tk.Tk for a widget to be created inside it.
+    '''
+    _w = '.'
+
+    def __init__(self):
+        self.tk = FakeTk()
+        self._last_child_ids = None
+        self.children = {}
+
+
+def seeded_board(grid_size, density):
+    '''
+    Returns a BoardModel whose pokemons only depend on the grid size and density.
+    '''
+    random.seed(f'{grid_size}-{density}')
+    return BoardModel(grid_size, max(1, int(grid_size ** 2 * density)))
+
+
+def flood_board(grid_size, density):
+    '''
+    Returns a seeded board with no pokemon in the middle half of the grid,
+    and the centre cell, so revealing it floods at least a quarter of the board.
+
+    A random board at these densities only has small areas without pokemons
+    around them, which would leave the flood cases timing a handful of cells.
+    '''
+    model = seeded_board(grid_size, density)
+    low, high = grid_size // 4, grid_size - grid_size // 4
+    kept = [index for index in model.get_pokemon_locations()
+            if not (low <= index % grid_size < high and low <= index // grid_size < high)]
+    model.set_pokemon_locations(kept, [model.get_pokemon_sprite(index) for index in kept])
+    model._num_pokemon = len(kept)
+    return model, grid_size // 2 * (grid_size + 1)
+
+
+def sample_indexes(grid_size, count = 1000):
+    '''
+    Returns the same pseudo random cell indexes for a grid size on every run.
+    '''
+    rng = random.Random(grid_size)
+    return [rng.randrange(grid_size ** 2) for _ in range(count)]
+
+
+def time_case(prepare, budget, min_repeat = 3, max_repeat = 1000):
+    '''
+    Time a case until the time budget is spent.
+
+    Parameters:
+        prepare (callable): Called untimed before each repeat; returns the
+            callable to time.
+        budget (float): Seconds to spend on the case, preparing included,
+            after the first repeats.
+        min_repeat (int): The number of repeats always made.
+        max_repeat (int): The number of repeats never exceeded.
+
+    Returns:
+        (dict): The best and median seconds per repeat and the repeat count.
+    '''
+    timings = []
+    deadline = time.perf_counter() + budget
+    while len(timings) < max_repeat and (len(timings) < min_repeat or time.perf_counter() < deadline):
+        run = prepare()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return {'min': min(timings), 'median': statistics.median(timings), 'repeat': len(timings)}
+
+
+def model_cases(grid_size, density):
+    '''
+    Returns (name, prepare) pairs for the BoardModel cases of one board.
+    '''
+    model = seeded_board(grid_size, density)
+    locations = model.get_pokemon_locations()
+    num_pokemon = len(locations)
+    flood, start = flood_board(grid_size, density)
+    flood_locations = flood.get_pokemon_locations()
+    indexes = sample_indexes(grid_size)
+    covered = UNEXPOSED * grid_size ** 2
+
+    def generate():
+        random.seed(f'{grid_size}-{density}')
+        return lambda: BoardModel(grid_size, num_pokemon)
+
+    def numbers():
+        model._board = covered
+        return lambda: [model.number_at_cell(locations, grid_size, i) for i in indexes]
+
+    def search():
+        flood._board = covered
+        return lambda: flood.big_fun_search(grid_size, flood_locations, start)
+
+    def reveal():
+        flood._board = covered
+        return lambda: flood.reveal_cells(grid_size, flood_locations, start)
+
+    def flags():
+        model._board = covered
+        model._attempted_catches_num = 0
+        def run():
+            for i in indexes[:100]:
+                model.flag_cell(i)
+                model.flag_cell(i)
+        return run
+
+    def game_over():
+        # every cell open or flagged, so the check has to scan the whole board.
+        flood._board = covered
+        flood.reveal_cells(grid_size, flood_locations, start)
+        flood._board = flood.get_game().replace(UNEXPOSED, FLAG)
+        def run():
+            for _ in range(1000):
+                game_state(flood)
+        return run
+
+    return [('generate_pokemons', generate),
+            ('number_at_cell x1000', numbers),
+            ('big_fun_search', search),
+            ('reveal_cells', reveal),
+            ('flag_cell x200', flags),
+            ('check_game_over x1000', game_over)]
+
+
+def draw_cases(grid_size, density):
+    '''
+    Returns (name, prepare) pairs timing the board views against FakeTk.
+    '''
+    import pokemon_gui
+    for image_name in pokemon_gui.CRITICAL_IMAGES + pokemon_gui.LATER_IMAGES:
+        # a name is all FakeTk needs, so no image is decoded.
+        pokemon_gui._images.setdefault(image_name, image_name)
+    model, start = flood_board(grid_size, density)
+    locations = model.get_pokemon_locations()
+    covered = UNEXPOSED * grid_size ** 2
+    model._board = covered
+    model.reveal_cells(grid_size, locations, start)
+    played = model.get_game()
+    cases = []
+    for view_class in (pokemon_gui.BoardView, pokemon_gui.ImageBoardView):
+        def full(view_class = view_class):
+            view = view_class(FakeRoot(), grid_size, model, None)
+            return lambda: view.draw_board(played)
+
+        def changed(view_class = view_class):
+            view = view_class(FakeRoot(), grid_size, model, None)
+            view.draw_board(covered)
+            return lambda: view.draw_board(played)
+
+        cases.append((f'{view_class.__name__}.draw_board full', full))
+        cases.append((f'{view_class.__name__}.draw_board after reveal', changed))
+    return cases
+
+
+def run_benchmarks(grid_sizes = GRID_SIZES, densities = DENSITIES, budget = 0.5, draw = True, log = None,
+                   rounds = 3):
+    '''
+    Run every case on every seeded board.
+
+    The cases are run in several rounds, each taking a share of the budget,
+    so a few slow moments of the machine only spoil one round of a case.
+
+    Parameters:
+        grid_sizes (tuple<int>): The grid sizes to benchmark.
+        densities (tuple<float>): The share of cells holding a pokemon.
+        budget (float): Seconds to spend per case.
+        draw (bool): Whether to include the draw cases.
+        log (file): Where to print progress, if anywhere.
+        rounds (int): The number of rounds over all the cases.
+
+    Returns:
+        (dict): Case name to timings.
+    '''
+    cases = []
+    for grid_size in grid_sizes:
+        for density in densities:
+            board_cases = model_cases(grid_size, density)
+            if draw and grid_size <= DRAW_MAX_GRID:
+                board_cases += draw_cases(grid_size, density)
+            cases += [(f'{name} grid={grid_size} density={density}', prepare)
+                      for name, prepare in board_cases]
+    timings = {key: [] for key, _ in cases}
+    for _ in range(rounds):
+        for key, prepare in cases:
+            timings[key].append(time_case(prepare, budget / rounds, min_repeat = 1))
+    results = {}
+    for key, runs in timings.items():
+        results[key] = {'min': min(run['min'] for run in runs),
+                        'median': statistics.median(run['median'] for run in runs),
+                        'repeat': sum(run['repeat'] for run in runs)}
+        if log is not None:
+            print(f'{key:<70}{results[key]["median"] * 1000:12.3f} ms', file = log)
+    return results
+
+
+def load_history(path):
+    '''
+    Returns the list of recorded runs, empty if there is no history yet.
+    '''
+    try:
+        with open(path, 'r') as history_file:
+            return json.load(history_file)
+    except FileNotFoundError:
+        return []
+
+
+def save_run(path, results):
+    '''
+    Append a run to the history file.
+    '''
+    history = load_history(path)
+    history.append({'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'python': platform.python_version(),
+                    'machine': platform.machine(),
+                    'results': results})
+    with open(path, 'w') as history_file:
+        json.dump(history, history_file, indent = 1)
+
+
+def median_run(runs):
+    '''
+    Returns (dict): Case name to the median of the best times the runs recorded for it.
+
+    Parameters:
+        runs (list<dict>): Runs from the history.
+    '''
+    timings = {}
+    for run in runs:
+        for name, timing in run['results'].items():
+            timings.setdefault(name, []).append(timing['min'])
+    return {name: {'min': statistics.median(values)} for name, values in timings.items()}
+
+
+def compare_runs(baseline, latest, threshold):
+    '''
+    Find the cases which got slower.
+
+    The best time of each case is compared, as it is the least noisy, and
+    cases under NOISE_FLOOR in both runs are left out.
+
+    Parameters:
+        baseline (dict): Case timings of the older run, or of median_run().
+        latest (dict): Case timings of the newer run.
+        threshold (float): Allowed slowdown, 0.1 for 10%.
+
+    Returns:
+        (list<tuple<str, float, float>>): Name, old and new best time of each
+        case slower than the threshold allows.
+    '''
+    regressions = []
+    for name, timing in latest.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]['min'], timing['min']
+        if max(old, new) < NOISE_FLOOR:
+            continue
+        if new > old * (1 + threshold):
+            regressions.append((name, old, new))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Benchmark the pokemon game hot paths.')
+    parser.add_argument('--history', default = HISTORY_FILE)
+    commands = parser.add_subparsers(dest = 'command', required = True)
+    run = commands.add_parser('run', help = 'run the benchmarks and record them')
+    run.add_argument('--sizes', type = int, nargs = '+', default = GRID_SIZES)
+    run.add_argument('--densities', type = float, nargs = '+', default = DENSITIES)
+    run.add_argument('--budget', type = float, default = 0.5, help = 'seconds per case')
+    run.add_argument('--no-draw', action = 'store_true', help = 'skip the draw cases')
+    run.add_argument('--rounds', type = int, default = 3, help = 'rounds over all the cases')
+    compare = commands.add_parser('compare', help = 'compare the latest run to an older one')
+    compare.add_argument('--runs', type = int, default = BASELINE_RUNS,
+                         help = 'compare against the median of this many runs before the latest')
+    compare.add_argument('--baseline', type = int,
+                         help = 'history position of a single run to compare against instead')
+    compare.add_argument('--threshold', type = float, default = 0.1)
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        results = run_benchmarks(args.sizes, args.densities, args.budget, not args.no_draw, sys.stdout,
+                                 args.rounds)
+        save_run(args.history, results)
+        return 0
+    history = load_history(args.history)
+    if len(history) < 2:
+        print(f'{args.history} needs at least two runs to compare')
+        return 1
+    if args.baseline is None:
+        baseline = median_run(history[-1 - max(1, args.runs):-1])
+    elif 0 <= args.baseline < len(history) - 1 or -len(history) <= args.baseline <= -2:
+        baseline = history[args.baseline]['results']
+    else:
+        print(f'--baseline must name one of the {len(history) - 1} runs before the latest '
+              f'(0 to {len(history) - 2}, or -2 to -{len(history)})')
+        return 1
+    regressions = compare_runs(baseline, history[-1]['results'], args.threshold)
+    for name, old, new in regressions:
+        print(f'slower: {name:<70}{old * 1000:10.3f} ms -> {new * 1000:10.3f} ms')
+    print(f'{len(regressions)} regression(s) above {args.threshold:.0%}')
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
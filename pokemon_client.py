@@ -0,0 +1,241 @@
+"""
+Load generator for pokemon_server.
+
+Opens a number of connections, runs many sessions on each of them and keeps
+every session playing random reveals until the time is up. With --local the
+server runs in the same process, so everything stays on localhost.
+"""
+
+import argparse,asyncio,itertools,json,random,time
+
+from pokemon_model import UNEXPOSED
+from pokemon_engine import PLAYING
+from pokemon_server import GameServer, start_server
+
+
+class Connection:
+    '''
+    One client connection, matching replies to requests by their id.
+    '''
+    def __init__(self, reader, writer):
+        '''
+        Parameters:
+            reader (asyncio.StreamReader): The incoming side of the connection.
+            writer (asyncio.StreamWriter): The outgoing side of the connection.
+        '''
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._waiting = {}
+        # before Python 3.10 drain() only allows one waiter at a time.
+        self._drain_lock = asyncio.Lock()
+        self._read_task = asyncio.ensure_future(self.read_replies())
+
+    async def request(self, message):
+        '''
+        Send a request and wait for its reply.
+
+        Parameters:
+            message (dict): The request to send.
+
+        Returns:
+            (dict): The reply.
+        '''
+        if self._read_task.done():
+            raise ConnectionError('connection closed')
+        message['id'] = request_id = next(self._ids)
+        reply = self._waiting[request_id] = asyncio.get_running_loop().create_future()
+        self._writer.write(json.dumps(message, separators = (',', ':')).encode() + b'\n')
+        async with self._drain_lock:
+            await self._writer.drain()
+        return await reply
+
+    async def read_replies(self):
+        '''
+        Hand every reply to the request waiting for it.
+
+        When the connection ends, or sends something which is not a reply,
+        every request still waiting fails.
+        '''
+        error = ConnectionError('connection closed')
+        while True:
+            try:
+                line = await self._reader.readline()
+            except (ConnectionError, ValueError) as reason:
+                error = ConnectionError(f'connection failed: {reason}')
+                break
+            if not line:
+                break
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                reply = None
+            if not isinstance(reply, dict):
+                error = ConnectionError(f'bad reply: {line[:80]!r}')
+                break
+            waiting = self._waiting.pop(reply.get('id'), None)
+            if waiting is not None and not waiting.done():
+                waiting.set_result(reply)
+        for waiting in self._waiting.values():
+            if not waiting.done():
+                waiting.set_exception(error)
+        self._waiting.clear()
+
+    async def close(self):
+        '''
+        Close the connection.
+        '''
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._read_task.cancel()
+
+
+class LoadStats:
+    '''
+    Count the moves, games and latencies of the load run.
+    '''
+    def __init__(self):
+        self.moves = 0
+        self.games = 0
+        self.busy = 0
+        self.latencies = []
+
+    def percentile(self, fraction):
+        '''
+        Returns the latency in seconds below which the given fraction of moves fall.
+
+        Parameters:
+            fraction (float): Between 0 and 1.
+        '''
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def play_session(connection, grid_size, num_pokemon, deadline, stats):
+    '''
+    Keep playing games on one session until the deadline.
+
+    Parameters:
+        connection (Connection): The connection to play over.
+        grid_size (int): The grid size of each game.
+        num_pokemon (int): The number of pokemons of each game.
+        deadline (float): The time.perf_counter() value to stop at.
+        stats (LoadStats): Where the results are counted.
+    '''
+    while time.perf_counter() < deadline:
+        reply = await connection.request({'op': 'new', 'grid_size': grid_size,
+                                          'num_pokemon': num_pokemon})
+        if 'error' in reply:
+            return
+        session = reply['session']
+        board = [UNEXPOSED] * (grid_size ** 2)
+        hidden = list(range(grid_size ** 2))
+        random.shuffle(hidden)
+        state = PLAYING
+        while state == PLAYING and hidden and time.perf_counter() < deadline:
+            index = hidden[-1]
+            if board[index] != UNEXPOSED:
+                hidden.pop()
+                continue
+            start = time.perf_counter()
+            reply = await connection.request({'op': 'reveal', 'session': session, 'index': index})
+            stats.latencies.append(time.perf_counter() - start)
+            if reply.get('error') == 'busy':
+                stats.busy += 1
+                await asyncio.sleep(0.001)
+                continue
+            if 'error' in reply:
+                break
+            stats.moves += 1
+            hidden.pop()
+            for cell, char in reply['cells']:
+                board[cell] = char
+            state = reply['state']
+        stats.games += 1
+        await connection.request({'op': 'close', 'session': session})
+
+
+def reply_limit(grid_size):
+    '''
+    Returns the longest reply line a game of grid_size can get, in bytes.
+
+    A flood can send back every cell as [index,"c"], a board op every cell as one character.
+    '''
+    return max(2 ** 16, (len(str(grid_size ** 2)) + 7) * grid_size ** 2 + 4096)
+
+
+async def run_load(connections, sessions, grid_size, num_pokemon, duration,
+                   host = '127.0.0.1', port = 8765, unix = None):
+    '''
+    Open the connections, play the sessions and collect the results.
+
+    Parameters:
+        connections (int): The number of connections to open.
+        sessions (int): The number of sessions spread over the connections.
+        grid_size (int): The grid size of each game.
+        num_pokemon (int): The number of pokemons of each game.
+        duration (float): How long to play in seconds.
+        host (str): The server address.
+        port (int): The server TCP port.
+        unix (str): The server Unix socket path, used instead of TCP if given.
+
+    Returns:
+        (LoadStats): The results of the run.
+    '''
+    opened = []
+    limit = reply_limit(grid_size)
+    for _ in range(connections):
+        if unix:
+            reader, writer = await asyncio.open_unix_connection(unix, limit = limit)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit = limit)
+        opened.append(Connection(reader, writer))
+    stats = LoadStats()
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(play_session(opened[i % connections], grid_size, num_pokemon, deadline, stats)
+                           for i in range(sessions)))
+    for connection in opened:
+        await connection.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Generate load for pokemon_server.')
+    parser.add_argument('--host', default = '127.0.0.1')
+    parser.add_argument('--port', type = int, default = 8765)
+    parser.add_argument('--unix', help = 'connect to this Unix socket path instead of TCP')
+    parser.add_argument('--local', action = 'store_true', help = 'run the server in this process')
+    parser.add_argument('--connections', type = int, default = 10)
+    parser.add_argument('--sessions', type = int, default = 1000)
+    parser.add_argument('--grid-size', type = int, default = 10)
+    parser.add_argument('--num-pokemon', type = int, default = 15)
+    parser.add_argument('--duration', type = float, default = 10.0)
+    args = parser.parse_args()
+
+    async def run():
+        port = args.port
+        server = None
+        if args.local:
+            server = await start_server(GameServer(max_sessions = args.sessions,
+                                                   max_grid_size = max(50, args.grid_size)),
+                                        args.host, 0, args.unix)
+            if not args.unix:
+                port = server.sockets[0].getsockname()[1]
+        try:
+            return await run_load(args.connections, args.sessions, args.grid_size,
+                                  args.num_pokemon, args.duration, args.host, port, args.unix)
+        finally:
+            if server is not None:
+                server.close()
+                await server.wait_closed()
+
+    stats = asyncio.run(run())
+    print(f'sessions: {args.sessions} over {args.connections} connections')
+    print(f'games: {stats.games}  moves: {stats.moves}  busy replies: {stats.busy}')
+    print(f'moves/sec: {stats.moves / args.duration:.0f}')
+    print(f'latency p50: {stats.percentile(0.5) * 1000:.2f} ms  p99: {stats.percentile(0.99) * 1000:.2f} ms')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+A small-footprint game state for hosting many games at once.
+
+CompactBoard answers the same calls as BoardModel which pokemon_engine and
+pokemon_server make, but keeps the board as three bit planes (pokemons,
+revealed cells and flags) in a single bytearray instead of a game string and
+a tuple of indexes. Numbers are worked out from the pokemon plane when asked.
+
+Run this module to print the traced bytes per session of both types.
+"""
+
+import random,tracemalloc
+
+from pokemon_model import BoardModel, UNEXPOSED, POKEMON, FLAG, PLAYING, WON, LOST
+
+POKEMON_PLANE = 0
+REVEALED_PLANE = 1
+FLAG_PLANE = 2
+
+
+class PokemonLocations:
+    '''
+    Read-only view of the pokemon plane, usable where a tuple of indexes is expected.
+    '''
+    __slots__ = ('_board',)
+
+    def __init__(self, board):
+        self._board = board
+
+    def __contains__(self, index):
+        return self._board.has_bit(POKEMON_PLANE, index)
+
+    def __iter__(self):
+        board = self._board
+        return (index for index in range(board.get_grid_size() ** 2)
+                if board.has_bit(POKEMON_PLANE, index))
+
+    def __len__(self):
+        return min(self._board.get_num_pokemon(), self._board.get_grid_size() ** 2)
+
+    def __repr__(self):
+        return repr(tuple(self))
+
+
+class CompactBoard:
+    '''
+    Store the game state as bit planes, with no per-instance dict.
+    '''
+    __slots__ = ('_grid_size', '_num_pokemon', '_attempted_catches_num',
+                 '_revealed_num', '_lost', '_planes')
+
+    def __init__(self, grid_size, num_pokemon, pokemon_locations = None):
+        """
+        Construct a covered board.
+
+        Parameters:
+            grid_size (int): The grid size of the game.
+            num_pokemon (int): The number of pokemons that the game will have.
+            pokemon_locations (iterable<int>): Place the pokemons here instead of
+                at random.
+        """
+        self._grid_size = grid_size
+        self._num_pokemon = num_pokemon
+        self._attempted_catches_num = 0
+        self._revealed_num = 0
+        self._lost = False
+        self._planes = bytearray(3 * ((grid_size ** 2 + 7) >> 3))
+        if pokemon_locations is None:
+            pokemon_locations = random.sample(range(grid_size ** 2), min(num_pokemon, grid_size ** 2))
+        for index in pokemon_locations:
+            self.set_bit(POKEMON_PLANE, index, True)
+
+    def has_bit(self, plane, index):
+        '''
+        Returns whether the bit of index is set in the plane.
+        '''
+        offset = plane * (len(self._planes) // 3) + (index >> 3)
+        return bool(self._planes[offset] & (1 << (index & 7)))
+
+    def set_bit(self, plane, index, value):
+        '''
+        Set or clear the bit of index in the plane.
+        '''
+        offset = plane * (len(self._planes) // 3) + (index >> 3)
+        if value:
+            self._planes[offset] |= 1 << (index & 7)
+        else:
+            self._planes[offset] &= ~(1 << (index & 7))
+
+    def get_grid_size(self):
+        '''
+        Returns the grid size of the game.
+        '''
+        return self._grid_size
+
+    def get_num_pokemon(self):
+        '''
+        Returns the number of pokemon hidden in the game.
+        '''
+        return self._num_pokemon
+
+    def get_pokemon_locations(self):
+        '''
+        Returns a view of the pokemon locations supporting in, len and iteration.
+        '''
+        return PokemonLocations(self)
+
+    def get_num_attempted_catches(self):
+        '''
+        Returns the number of pokeballs currently placed on the board.
+        '''
+        return self._attempted_catches_num
+
+    def get_num_pokeball_leave(self):
+        '''
+        Return the number of left pokeballs
+        '''
+        return max(0, self._num_pokemon - self._attempted_catches_num)
+
+    def position_to_index(self, position, grid_size):
+        '''
+        Convert the row, column coordinate in the grid to the game strings index.
+        '''
+        x, y = position
+        return x + y * self._grid_size
+
+    def neighbours(self, index):
+        '''
+        Returns the indexes of the up to eight cells around index.
+        '''
+        grid_size = self._grid_size
+        x, y = index % grid_size, index // grid_size
+        return [nx + ny * grid_size
+                for ny in range(max(0, y - 1), min(grid_size, y + 2))
+                for nx in range(max(0, x - 1), min(grid_size, x + 2))
+                if nx != x or ny != y]
+
+    def number_at_cell(self, pokemon_locations, grid_size, index):
+        '''
+        Returns the number of pokemons around index.
+        '''
+        return sum(1 for neighbour in self.neighbours(index)
+                   if self.has_bit(POKEMON_PLANE, neighbour))
+
+    def get_cell(self, index):
+        '''
+        Returns the character the game string would have at index.
+        '''
+        if self.has_bit(FLAG_PLANE, index):
+            return FLAG
+        if not self.has_bit(REVEALED_PLANE, index):
+            return UNEXPOSED
+        if self.has_bit(POKEMON_PLANE, index):
+            return POKEMON
+        return str(self.number_at_cell(None, self._grid_size, index))
+
+    def get_game(self):
+        '''
+        Returns the game string of the board, built on every call.
+        '''
+        return ''.join(self.get_cell(index) for index in range(self._grid_size ** 2))
+
+    def get_state(self):
+        '''
+        Returns LOST, WON or PLAYING from the counters, without reading the board.
+        '''
+        if self._lost:
+            return LOST
+        pokemon_num = min(self._num_pokemon, self._grid_size ** 2)
+        if (self._attempted_catches_num == pokemon_num
+                and self._revealed_num + self._attempted_catches_num == self._grid_size ** 2):
+            return WON
+        return PLAYING
+
+    def replace_character_at_index(self, index, character):
+        '''
+        Set the cell at index to the given game string character.
+        '''
+        if self.has_bit(FLAG_PLANE, index):
+            self.set_bit(FLAG_PLANE, index, False)
+            if character != POKEMON:
+                self._attempted_catches_num -= 1
+        if self.has_bit(REVEALED_PLANE, index):
+            self.set_bit(REVEALED_PLANE, index, False)
+            self._revealed_num -= 1
+        if character == FLAG:
+            self.set_bit(FLAG_PLANE, index, True)
+            self._attempted_catches_num += 1
+        elif character != UNEXPOSED:
+            self.set_bit(REVEALED_PLANE, index, True)
+            self._revealed_num += 1
+            if character == POKEMON:
+                self._lost = True
+
+    def flag_cell(self, index):
+        '''
+        Toggle Flag on or off at selected index, like BoardModel.flag_cell.
+
+        Returns:
+            (bool): Whether the cell changed.
+        '''
+        if self.has_bit(FLAG_PLANE, index):
+            self.set_bit(FLAG_PLANE, index, False)
+            self._attempted_catches_num -= 1
+            return True
+        if self.has_bit(REVEALED_PLANE, index) or self.get_num_pokeball_leave() == 0:
+            return False
+        self.set_bit(FLAG_PLANE, index, True)
+        self._attempted_catches_num += 1
+        return True
+
+    def reveal_indexes(self, grid_size, pokemon_locations, index):
+        '''
+        Reveal index and flood out from cells with no pokemon around them,
+        the same way BoardModel.reveal_indexes does.
+
+        Returns:
+            (list<int>): The indexes which were revealed.
+        '''
+        revealed = []
+        if not self.has_bit(REVEALED_PLANE, index):
+            self.set_bit(REVEALED_PLANE, index, True)
+            self._revealed_num += 1
+            revealed.append(index)
+        if self.has_bit(FLAG_PLANE, index) or self.number_at_cell(None, grid_size, index) != 0:
+            return revealed
+        queue = [index]
+        discovered = {index}
+        while queue:
+            node = queue.pop()
+            for neighbour in self.neighbours(node):
+                if neighbour in discovered:
+                    continue
+                discovered.add(neighbour)
+                if self.has_bit(FLAG_PLANE, neighbour):
+                    continue
+                if not self.has_bit(REVEALED_PLANE, neighbour):
+                    self.set_bit(REVEALED_PLANE, neighbour, True)
+                    self._revealed_num += 1
+                    revealed.append(neighbour)
+                if self.number_at_cell(None, grid_size, neighbour) == 0:
+                    queue.append(neighbour)
+        return revealed
+
+    def reveal_cells(self, grid_size, pokemon_locations, index):
+        '''
+        Reveal like BoardModel.reveal_cells and return the game string.
+        '''
+        self.reveal_indexes(grid_size, pokemon_locations, index)
+        return self.get_game()
+
+
+def measure_session_bytes(board_class, grid_size, num_pokemon, count = 1000):
+    '''
+    Measure the memory a mid-game session takes with tracemalloc.
+
+    Each board gets one pokeball and one revealed cell, so game strings are
+    measured after a flag widens them.
+
+    Parameters:
+        board_class (class): BoardModel or CompactBoard.
+        grid_size (int): The grid size of the game.
+        num_pokemon (int): The number of pokemons of the game.
+        count (int): How many boards to average over.
+
+    Returns:
+        (float): Traced bytes per board.
+    '''
+    boards = [None] * count
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(count):
+            board = board_class(grid_size, num_pokemon)
+            locations = board.get_pokemon_locations()
+            board.flag_cell(next(iter(locations)))
+            safe = next(index for index in range(grid_size ** 2) if index not in locations)
+            board.replace_character_at_index(safe, str(board.number_at_cell(locations, grid_size, safe)))
+            boards[i] = board
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / count
+
+
+def main():
+    print(f'{"grid":>6}{"pokemons":>10}{"BoardModel":>14}{"CompactBoard":>14}')
+    for grid_size in (10, 16, 30, 50):
+        num_pokemon = grid_size ** 2 * 15 // 100
+        count = max(100, 100000 // grid_size ** 2)
+        model = measure_session_bytes(BoardModel, grid_size, num_pokemon, count)
+        compact = measure_session_bytes(CompactBoard, grid_size, num_pokemon, count)
+        print(f'{grid_size:>6}{num_pokemon:>10}{model:>12.0f} B{compact:>12.0f} B')
+
+if __name__ == "__main__":
+    main()
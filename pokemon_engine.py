@@ -0,0 +1,66 @@
+#author: YI DING
+#email: dydifferent@gmail.com
+#The University of Queensland
+#May 2020
+
+from pokemon_model import UNEXPOSED, POKEMON, FLAG, PLAYING, WON, LOST
+
+
+def reveal_move(model, index):
+    """
+    Play a left click at index on the board model.
+
+    Catching a pokemon reveals every pokemon, otherwise the cell and its empty
+    neighbours are revealed. Flagged cells are left untouched.
+
+    Parameters:
+        model (BoardModel): The board model to play on.
+        index (int): The index in the game string which was clicked.
+
+    Returns:
+        (list<int>): The indexes whose character changed.
+    """
+    pokemon_locations = model.get_pokemon_locations()
+    if model.get_cell(index) == FLAG:
+        return []
+    if index in pokemon_locations:
+        changed = []
+        for location in pokemon_locations:
+            if model.get_cell(location) != POKEMON:
+                model.replace_character_at_index(location, POKEMON)
+                changed.append(location)
+        return changed
+    if model.get_cell(index) != UNEXPOSED:
+        return []
+    return model.reveal_indexes(model.get_grid_size(), pokemon_locations, index)
+
+
+def flag_move(model, index):
+    """
+    Play a right click at index on the board model.
+
+    Parameters:
+        model (BoardModel): The board model to play on.
+        index (int): The index in the game string which was clicked.
+
+    Returns:
+        (list<int>): The indexes whose character changed.
+    """
+    before = model.get_cell(index)
+    model.flag_cell(index)
+    if model.get_cell(index) != before:
+        return [index]
+    return []
+
+
+def game_state(model):
+    """
+    Work out whether the game on the board model is lost, won or still going.
+
+    Parameters:
+        model (BoardModel): The board model to check.
+
+    Returns:
+        (str): One of LOST, WON or PLAYING.
+    """
+    return model.get_state()
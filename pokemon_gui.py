@@ -0,0 +1,744 @@
+#author: YI DING
+#email: dydifferent@gmail.com
+#The University of Queensland
+#May 2020
+
+import time,base64,queue,threading
+import tkinter as tk
+from tkinter import messagebox
+from tkinter import simpledialog
+
+from pokemon_model import BoardModel, UNEXPOSED, POKEMON, FLAG
+from pokemon_engine import reveal_move, flag_move, game_state, WON, LOST
+from pokemon_instrument import instrumentation
+
+TASK_ONE = 'TASK_ONE'
+TASK_TWO = 'TASK_TWO'
+square_size = 60
+CELL_COLOURS = {UNEXPOSED: '#054a29', FLAG: '#e6071d', POKEMON: '#f5e90a'}
+POKEMON_SPRITES = ("images/pokemon_sprites/pikachu",
+                   "images/pokemon_sprites/charizard",
+                   "images/pokemon_sprites/cyndaquil",
+                   "images/pokemon_sprites/psyduck",
+                   "images/pokemon_sprites/togepi",
+                   "images/pokemon_sprites/umbreon")
+NUMBER_IMAGES = ("images/zero_adjacent",
+                 "images/one_adjacent",
+                 "images/two_adjacent",
+                 "images/three_adjacent",
+                 "images/four_adjacent",
+                 "images/five_adjacent",
+                 "images/six_adjacent",
+                 "images/seven_adjacent",
+                 "images/eight_adjacent")
+# Images needed for the first frame, everything else is preloaded after it.
+CRITICAL_IMAGES = ("images/unrevealed", "images/full_pokeball", "images/clock")
+LATER_IMAGES = ("images/unrevealed_moved", "images/pokeball") + NUMBER_IMAGES + POKEMON_SPRITES
+_images = {}
+# Every recorded stage, in the order the latency overlay lists them.
+OVERLAY_STAGES = ('left_click', 'right_click', 'highlight', 'reveal_cells', 'flag_cell',
+                  'draw_board', 'tk_update', 'check_game_over')
+
+
+class BoardView(tk.Canvas):
+    '''
+    View the pokemon game board
+    '''
+    def __init__(self, master, grid_size, Model, pokemongame, board_width=600, *args, **kwargs):
+        '''
+        Construct a board view from a board layout.
+
+        Parameters:
+            master (tk.Widget): Widget within which the board is placed.
+            grid_size (int): Size of game.
+            Model(class): BoardModel class.
+            pokemongame(class):PokemonGame class.
+            board_width(int):the width of the board.
+        '''
+        super().__init__(master, *args, **kwargs)
+        self._master = master
+        self._grid_size = grid_size
+        self._board_width = board_width
+        self._BoardModel = Model
+        self._pokemongame = pokemongame
+        self._now_position = None
+        self._drawn_board = None
+        self._cell_items = {}
+        self._highlight_item = None
+        self.bind_clicks()
+        self.config(width = self._board_width, height = self._board_width)
+
+    def set_model(self, Model, grid_size):
+        '''
+        Rebind the view to another board model without rebuilding the canvas.
+
+        Parameters:
+            Model(class): BoardModel class.
+            grid_size (int): Size of game.
+        '''
+        if self._now_position and self._drawn_board is not None:
+            # put back the square board left under the cursor.
+            index = self._BoardModel.position_to_index(self._now_position, self._grid_size)
+            self.draw_cell(index, self._drawn_board[index])
+        if grid_size != self._grid_size:
+            self._drawn_board = None
+        self._grid_size = grid_size
+        self._BoardModel = Model
+        self._now_position = None
+
+    def draw_board(self, board):
+        '''
+        Given an appropriate representation of the current state of the game board, 
+        draw the view to reflect this game state.
+
+        Only the cells which changed since the last drawing are repainted.
+
+        Parameters:
+            board(string):The board game string.
+        '''
+        if self._drawn_board is None or len(self._drawn_board) != len(board):
+            # nothing usable on the canvas yet, draw every square board.
+            self.delete(tk.ALL)
+            self._cell_items = {}
+            self._highlight_item = None
+            changed = range(len(board))
+        else:
+            changed = [index for index, (old, new) in enumerate(zip(self._drawn_board, board))
+                       if old != new]
+        for index in changed:
+            self.draw_cell(index, board[index])
+        self._drawn_board = board
+
+    def draw_cell(self, index, char):
+        '''
+        Paint one square board, creating its canvas items the first time.
+
+        Parameters:
+            index (int): The index of the cell in the game string.
+            char (str): The character of the cell in the game string.
+        '''
+        items = self._cell_items.get(index)
+        if items is None:
+            x1, y1 = self.index_to_corner(index)
+            center_pixel = (x1 + square_size/2, y1 + square_size/2)
+            items = (self.create_rectangle(x1, y1, x1 + square_size, y1 + square_size),
+                     self.create_text(center_pixel[0], center_pixel[1]))
+            self._cell_items[index] = items
+        rectangle, text = items
+        if char in CELL_COLOURS:
+            self.itemconfig(rectangle, fill = CELL_COLOURS[char])
+            self.itemconfig(text, text = '')
+        else:
+            self.itemconfig(rectangle, fill = '#0fd174')
+            self.itemconfig(text, text = char)
+
+    def index_to_corner(self, index):
+        '''
+        Converts the index in the game string to the top left pixel of its cell.
+
+        Parameters:
+            index (int): The index of the cell in the game string.
+        '''
+        return (index % self._grid_size) * square_size, (index // self._grid_size) * square_size
+
+    def bind_clicks(self):
+        """
+        Bind clicks on a label to the left and right click handlers.
+        """
+        # bind left click
+        self.bind('<Button-1>', lambda e: self.left_click((e.x, e.y)))
+        # bind right click MAC
+        self.bind('<Button-2>', lambda e: self.right_click((e.x, e.y)))
+        # bind right click WINDOWS
+        self.bind('<Button-3>', lambda e: self.right_click((e.x, e.y)))
+        self.bind('<Motion>', lambda e: self.highlight((e.x, e.y)))
+
+    def left_click(self, pixel):
+        '''
+        Handle left clicking on a square board.
+
+        Parameters:
+            pixel(tuple):The grafic coordinate.
+        '''
+        with instrumentation.measure('left_click'):
+            position = self.pixel_to_position(pixel)
+            index = self._BoardModel.position_to_index(position, self._grid_size)
+            with instrumentation.measure('reveal_cells'):
+                reveal_move(self._BoardModel, index)
+            with instrumentation.measure('draw_board'):
+                self.draw_board(self._BoardModel.get_game())
+            with instrumentation.measure('tk_update'):
+                self._master.update()
+        self.count_items()
+        self._pokemongame.check_game_over(position)
+        
+    def right_click(self, pixel):
+        """
+        Handle right clicking on a square board.
+
+        Parameters:
+            pixel(tuple):The grafic coordinate.
+        """
+        with instrumentation.measure('right_click'):
+            position = self.pixel_to_position(pixel)
+            index = self._BoardModel.position_to_index(position, self._grid_size)
+            with instrumentation.measure('flag_cell'):
+                flag_move(self._BoardModel, index)
+            with instrumentation.measure('draw_board'):
+                self.draw_board(self._BoardModel.get_game())
+            with instrumentation.measure('tk_update'):
+                self._master.update()
+        self.count_items()
+        self._pokemongame.check_game_over(position)
+
+    def count_items(self):
+        '''
+        Record the number of canvas items while instrumentation is on.
+        '''
+        if instrumentation.enabled:
+            instrumentation.record_canvas_items(len(self.find_all()))
+
+    def highlight(self,pixel):
+        '''
+        Handel the highlight with the cursor moving
+
+        Parameters:
+            pixel(tuple):The grafic coordinate.
+        '''
+        with instrumentation.measure('highlight'):
+            if pixel[0] in range(self._grid_size * square_size):
+                if pixel[1] in range(self._grid_size * square_size):
+                    position = self.pixel_to_position(pixel)
+                    if self._now_position != position:
+                        self.move_highlight(self._now_position, position)
+                        self._now_position = position
+
+    def move_highlight(self, old_position, position):
+        '''
+        Move the highlight outline from the old position to the new one.
+
+        Parameters:
+            old_position(tuple):The previous highlighted position, or None.
+            position(tuple):The position under the cursor.
+        '''
+        x1, y1 = position[0] * square_size, position[1] * square_size
+        if self._highlight_item is None:
+            self._highlight_item = self.create_rectangle(x1, y1, x1 + square_size, y1 + square_size,
+                                                         outline = '#34b1eb')
+        else:
+            self.coords(self._highlight_item, x1, y1, x1 + square_size, y1 + square_size)
+        self.tag_raise(self._highlight_item)
+
+    def pixel_to_position(self, pixel): 
+        '''
+        Converts the supplied pixel to the position of the cell it is contained within.
+
+        Parameters:
+            pixel(tuple):The grafic coordinate.
+        '''
+        x, y = pixel[0], pixel[1]
+        position = (x // square_size, y // square_size)
+        return position 
+
+    def position_to_pixel(self, position): 
+        '''
+        Converts position to the center postion of each square.
+
+        Parameters:
+            position:The position of each sqaure.
+
+        Returns the center pixel for the cell at position.
+        '''
+        return (position[0] * square_size + square_size/2, position[1] * square_size +square_size/2)
+
+class ImageBoardView(BoardView):
+    '''
+    View the pokemon game board with pictures.
+    '''
+    def draw_cell(self, index, char):
+        '''
+        Paint one square board with its picture, creating the canvas image the first time.
+
+        Parameters:
+            index (int): The index of the cell in the game string.
+            char (str): The character of the cell in the game string.
+        '''
+        if char == UNEXPOSED:
+            image_name = "images/unrevealed"
+        elif char == FLAG:
+            image_name = "images/pokeball"
+        elif char == POKEMON:
+            image_name = POKEMON_SPRITES[self._BoardModel.get_pokemon_sprite(index)]
+        else:
+            image_name = NUMBER_IMAGES[int(char)]
+        image = get_image(image_name)
+        item = self._cell_items.get(index)
+        if item is None:
+            x1, y1 = self.index_to_corner(index)
+            self._cell_items[index] = self.create_image(x1 + square_size/2, y1 + square_size/2, image = image)
+        else:
+            self.itemconfig(item, image = image)
+
+    def move_highlight(self, old_position, position):
+        '''
+        Swap the unrevealed picture under the cursor for the moved one,
+        and restore the picture of the previous position.
+
+        Parameters:
+            old_position(tuple):The previous highlighted position, or None.
+            position(tuple):The position under the cursor.
+        '''
+        board = self._BoardModel.get_game()
+        if old_position:
+            old_index = self._BoardModel.position_to_index(old_position, self._grid_size)
+            if board[old_index] == UNEXPOSED and old_index in self._cell_items:
+                self.itemconfig(self._cell_items[old_index], image = get_image('images/unrevealed'))
+        index = self._BoardModel.position_to_index(position, self._grid_size)
+        if board[index] == UNEXPOSED and index in self._cell_items:
+            self.itemconfig(self._cell_items[index], image = get_image('images/unrevealed_moved'))
+
+
+class PokemonGame:
+    '''
+    PokemonGame represents the controller class. 
+    '''  
+    def __init__(self, master, grid_size = 10, num_pokemon = 15,task = TASK_TWO, no_guess = False):
+        '''
+        Construct a new pokemon game within a master widget.
+        
+        Parameters:
+            master (tk.Widget):Widget within which the board is placed.
+            grid_size (int):Size of game.
+            num_pokemon (int):The number of pokemons that the game will have.
+            task(string):Choose show one game board.
+            no_guess(bool):Generate boards which never need a guess.
+        '''
+        self._master = master
+        self._grid_size = grid_size
+        self._num_pokemon = num_pokemon
+        self._task = task
+        self._no_guess = no_guess
+        self._BoardModel = BoardModel(self._grid_size, self._num_pokemon, self._no_guess)
+        self.open_safe_start()
+        self._overlay = None
+        self.draw()
+        if instrumentation.enabled:
+            self.show_overlay()
+        
+    def draw(self):
+        '''
+        Draw the game to the master widget.
+        '''
+        self._label = tk.Label(self._master, text='Pokemon: Got 2 Find Them All!', fg='white', bg='#d46a81',font=('Courier',25,'bold'))
+        self._label.pack(fill=tk.X)
+        if self._task == TASK_ONE:
+            self._BoardView = BoardView(self._master, self._grid_size, self._BoardModel, self)
+            self._BoardView.draw_board(self._BoardModel.get_game())
+            self._BoardView.pack(side = tk.TOP)
+        elif self._task == TASK_TWO:
+            self._ImageBoardView = ImageBoardView(self._master, self._grid_size, self._BoardModel, self)
+            self._ImageBoardView.draw_board(self._BoardModel.get_game())
+            self._ImageBoardView.pack(side = tk.TOP)
+            self._StatusBar = StatusBar(self._master, self._BoardModel, self)
+            self._StatusBar.pack(side = tk.BOTTOM)
+
+    def toggle_instrumentation(self):
+        '''
+        Switch latency recording and its overlay on or off.
+        '''
+        if instrumentation.enabled:
+            instrumentation.disable()
+            self.hide_overlay()
+        else:
+            instrumentation.enable()
+            self.show_overlay()
+
+    def show_overlay(self):
+        '''
+        Show the live p50/p99 latencies in the top right corner.
+        '''
+        if self._overlay is None:
+            self._overlay = tk.Label(self._master, justify = tk.LEFT, font = ('Courier', 9),
+                                     fg = '#34eb77', bg = 'black')
+            self._overlay.place(relx = 1.0, rely = 0.0, anchor = tk.NE)
+        self._overlay.config(text = instrumentation.overlay_text(OVERLAY_STAGES))
+        self._overlay_updater = self._overlay.after(500, self.show_overlay)
+
+    def hide_overlay(self):
+        '''
+        Remove the latency overlay.
+        '''
+        if self._overlay is not None:
+            self._overlay.after_cancel(self._overlay_updater)
+            self._overlay.destroy()
+            self._overlay = None
+
+    def save_game(self):
+        '''
+        Run the save function.
+        '''
+        save_txt = open('game_save.txt','w')
+        with save_txt as txt:
+            txt.write(f'grid_size: {self._grid_size}\n'
+                      f'pokemon_num: {self._num_pokemon}\n'
+                      f'timer: {self._StatusBar._time_record}\n'
+                      f'pokemon_locations: {self._BoardModel.get_pokemon_locations()}\n' 
+                      f'attempted_num: {self._BoardModel.get_num_attempted_catches()}\n'
+                      f'pokeball_leave: {self._BoardModel.get_num_pokeball_leave()}\n'
+                      f'board: {self._BoardModel.get_game()}\n'
+                      f'pokemon_sprites: {",".join(map(str, self._BoardModel.get_pokemon_sprites()))}')
+
+    def load_game(self):
+        '''
+        Run the load function.
+        '''
+        with open("game_save.txt",'r') as txt:
+            line = txt.readlines()
+            #get the grid_size record
+            grid_size = int((line[0].split())[1])
+            #get the pokemon_num record
+            num_pokemon = int((line[1].split())[1])
+            #get the time record
+            load_time_record = int((line[2].split())[1])
+            #get the pokemon_location record
+            if self._num_pokemon == 1:
+                clean_pokemon_location =(((line[3])[19:])[1:-2]).split(',')
+            else:
+                clean_pokemon_location =(((line[3])[19:])[1:-2]).split(', ')
+            pokemon_locations = ()
+            for i in range(0,self._num_pokemon):
+                index = int(clean_pokemon_location[i])
+                pokemon_locations += (index,)
+            #get the pokemon sprites record, older saves do not have one
+            sprites = None
+            if len(line) > 7:
+                sprites = [int(sprite) for sprite in line[7][17:].strip().split(',') if sprite]
+            self._BoardModel.set_pokemon_locations(pokemon_locations, sprites)
+            #get the attempted pokeballs record
+            self._BoardModel._attempted_catches_num = int((line[4].split())[1])
+            #the number of pokeballs left (line 5) follows from the attempted catches
+            #get the board string
+            self._BoardModel._board = (line[6])[7:].rstrip('\n')
+        self._grid_size = grid_size
+        self._num_pokemon = num_pokemon
+        self.reset_game(load_time_record)
+
+    def reset_game(self, load_time_record = 0):
+        '''
+        Reset the living widgets to show the current board model.
+
+        Parameters:
+            load_time_record(int):the record time people saved before.
+        '''
+        if self._task ==TASK_ONE:
+            self._BoardView.set_model(self._BoardModel, self._grid_size)
+            self._BoardView.draw_board(self._BoardModel.get_game())
+        elif self._task ==TASK_TWO:
+            self._ImageBoardView.set_model(self._BoardModel, self._grid_size)
+            self._ImageBoardView.draw_board(self._BoardModel.get_game())
+            self._StatusBar.reset(self._BoardModel, load_time_record)
+
+    def new_game(self):
+        '''
+        Start a new game, all functions need to be reset.
+        '''
+        self._BoardModel = BoardModel(self._grid_size, self._num_pokemon, self._no_guess)
+        self.open_safe_start()
+        self.reset_game()
+
+    def restart_game(self):
+        '''
+        Restart the current game, including game timer. Pokemon locations should persist.
+        '''
+        self._BoardModel._board = UNEXPOSED*(self._grid_size ** 2) 
+        self._BoardModel._attempted_catches_num = 0
+        self.open_safe_start()
+        self.reset_game()
+
+    def open_safe_start(self):
+        '''
+        Reveal the start cell of a no-guess board, so the first move is not a guess.
+        '''
+        start = self._BoardModel.get_safe_start()
+        if start is not None:
+            reveal_move(self._BoardModel, start)
+
+    def quit_game(self):
+        '''
+        Quit the game.
+        '''
+        response = messagebox.askyesno('Quit', 'Do you want to quit?')
+        if response:
+            self._master.destroy()
+        
+    def rank_score(self):
+        '''
+        Calculate the info and sort the grades.
+        '''
+        top3_num = 0
+        winner_info=[]
+        winner_record_txt = open('winner_record.txt','r')
+        root = tk.Tk()
+        root.title("Top 3")
+        tk.Label(root, text='High Scores', fg='white', bg='#d46a81',font=('Courier',25,'bold')).pack(fill = tk.X)
+        root.resizable(False, False)
+        with open("winner_record.txt",'r') as txt:
+            for line in txt:
+                winner_record = (line[:-1]).split(':')
+                winner_info.append([winner_record[0],int(winner_record[1])])
+        winner_info.sort(key =lambda element: element[1])
+        #Only display top 3 players' info.
+        for info in winner_info:
+            top3_num +=1
+            if top3_num <= 3:
+                if info[1] > 60:
+                    second = info[1] % 60
+                    minute = info[1] // 60
+                    tk.Label(root, text=f'{info[0]}: 'f'{minute}m 'f'{second}s').pack(side = tk.TOP)
+                else:
+                    tk.Label(root, text=f'{info[0]}: 'f'{info[1]}s').pack(side = tk.TOP)
+            else:
+                None
+        tk.Button(root, text = 'Done', command = root.destroy).pack(side = tk.TOP)
+
+    def socre_record(self):
+        '''
+        Record winner's name and grades.
+        '''
+        winner_record_txt = open('winner_record.txt','a')
+        winner_name = simpledialog.askstring(title = 'You win!',prompt = f'You won in {self._StatusBar._minute}m and' f'{self._StatusBar._second} s! Enter your name:')
+        winner_grade = self._StatusBar._time_record
+        winner_detail = f'{winner_name}:'f'{winner_grade}\n'
+        with winner_record_txt as txt:
+            txt.write(winner_detail)
+
+    def check_game_over(self,position):
+        '''
+        Check if the game is over and exit if so
+        '''
+        with instrumentation.measure('check_game_over'):
+            state = game_state(self._BoardModel)
+        if state == LOST:
+            if self._task == TASK_ONE:
+                response = messagebox.askyesno('Game Over', 'You lose! Would you like to play again?')
+                if response:
+                    self.new_game()
+                else:
+                    self._master.destroy()
+            else:
+                self._StatusBar.stop_timer()
+                response = messagebox.askyesno('Game Over', 'You lose! Would you like to play again?')
+                if response:
+                    self.new_game()
+                else:
+                    self._master.destroy()
+        elif state == WON:
+            if self._task ==TASK_TWO:
+                self._StatusBar.stop_timer()
+            response = messagebox.showinfo('Game Over', 'You won! :D')
+            if self._task == TASK_TWO:
+                self.socre_record()
+            self._master.destroy()
+                
+                
+        
+
+class StatusBar(tk.Frame):
+    '''
+    Show the current status of the game, inclouding timer, pokeballs amount and newgame or restart button.
+    '''
+    def __init__(self, master, Model, pokemongame, load_time_record = 0):
+        '''
+        Construct a new pokemon game status frame within a master widget.
+
+        Parameters:
+            master(tk.widgets):Widget within which the board is placed.
+            Model(class):The BoardModel class.
+            pokemongame(class):The PokemonGame class.
+            load_time_record(int):the record time people saved before.
+        '''
+        super().__init__(master)
+        self._master = master
+        self._pokemongame = pokemongame
+        self._BoardModel = Model
+        self._load_time_record = load_time_record
+        self._image=[]
+        self._attempted_ball = tk.StringVar()
+        self._left_ball = tk.StringVar()
+        self._record_time = tk.StringVar()
+        self._now_time = time.time()
+        self.file_menu()
+        self.pokeball_catch()
+        self.clock_record()
+        self.game_button()
+        self.update_attempted_ball()
+        self.update_timer()
+
+    def pokeball_catch(self):
+        '''
+        Draw the pokeballs status frame.
+        '''
+        self._pokeball_frame = tk.Frame(self)
+        image_1 = get_image('images/full_pokeball')
+        self._image.append(image_1)
+        self._pokeball_image = tk.Label(self._pokeball_frame, image = self._image[0], width = 60)
+        self._pokeball_image.pack(side=tk.LEFT)
+        self._attempted_catches = tk.Label(self._pokeball_frame, textvariable = self._attempted_ball)
+        self._attempted_catches.pack(side = tk.TOP, anchor = tk.W)
+        self._pokeballs_left = tk.Label(self._pokeball_frame,textvariable = self._left_ball)
+        self._pokeballs_left.pack(side = tk.TOP, anchor = tk.W)
+        self._pokeball_frame.pack(side = tk.LEFT)
+
+    def clock_record(self):
+        '''
+        Draw the timer frame.
+        '''
+        self._clock_frame = tk.Frame(self)
+        image_2 = get_image('images/clock')
+        self._image.append(image_2)
+        self._clock_image = tk.Label(self._clock_frame, image = self._image[1])
+        self._clock_image.pack(side=tk.LEFT)
+        self._time_elapsed = tk.Label(self._clock_frame, text = 'Time elapsed')
+        self._time_elapsed.pack()
+        self._time = tk.Label(self._clock_frame,textvariable = self._record_time)
+        self._time.pack()
+        self._clock_frame.pack(side = tk.LEFT)
+
+    def game_button(self):
+        '''
+        Draw the buttons of new game and restart game.
+        '''
+        self._button_frame = tk.Frame(self)
+        self._new_game_button = tk.Button(self._button_frame, text = 'New game', command = self._pokemongame.new_game)
+        self._new_game_button.pack(side = tk.TOP, padx = 60, pady = 5)
+        self._restart_game = tk.Button(self._button_frame,text = 'Restart game', command = self._pokemongame.restart_game)
+        self._restart_game.pack(side = tk.TOP, padx = 60, pady = 5)
+        self._button_frame.pack(side = tk.LEFT)
+
+    def file_menu(self):
+        '''
+        Draw the file menu
+        '''
+        self._menubar = tk.Menu(self._master)
+        self._master.config(menu = self._menubar)
+        self._file_menu = tk.Menu(self._menubar)
+        self._menubar.add_cascade(label = 'file', menu = self._file_menu)
+        self._file_menu.add_command(label = "Save game", command = self._pokemongame.save_game)
+        self._file_menu.add_command(label = "Load game", command = self._pokemongame.load_game)
+        self._file_menu.add_command(label = "Restart game", command = self._pokemongame.restart_game)
+        self._file_menu.add_command(label = "New game", command = self._pokemongame.new_game)
+        self._file_menu.add_command(label = 'Quit game', command = self._pokemongame.quit_game)
+        self._file_menu.add_command(label = 'High scores', command = self._pokemongame.rank_score)
+        self._profile_on = tk.BooleanVar(value = instrumentation.enabled)
+        self._file_menu.add_checkbutton(label = 'Latency overlay', variable = self._profile_on,
+                                        command = self._pokemongame.toggle_instrumentation)
+
+    def update_attempted_ball(self):
+        '''
+        update the pokeballs amount currently.
+        '''
+        self._attempted_ball.set(f'{self._BoardModel.get_num_attempted_catches()} attenpeted catches')
+        self._left_ball.set(f'{self._BoardModel.get_num_pokeball_leave()} pokeballs left')
+        self._updater = self.after(50, self.update_attempted_ball)
+        
+    def update_timer(self):
+        '''
+        Update the timer.
+        '''
+        self._time_record = int(time.time() - self._now_time) + self._load_time_record
+        self._second = self._time_record % 60
+        self._minute = self._time_record// 60
+        self._record_time.set(f'{self._minute}m 'f'{self._second} s')
+        self._timer = self.after(500, self.update_timer)
+
+    def stop_timer(self):
+        '''
+        Stop the timer.
+        '''
+        self.after_cancel(self._timer)
+
+    def reset(self, Model, load_time_record = 0):
+        '''
+        Bind a new board model and start the counters and the timer again.
+
+        Parameters:
+            Model(class):The BoardModel class.
+            load_time_record(int):the record time people saved before.
+        '''
+        self.after_cancel(self._updater)
+        self.after_cancel(self._timer)
+        self._BoardModel = Model
+        self._load_time_record = load_time_record
+        self._now_time = time.time()
+        self.update_attempted_ball()
+        self.update_timer()
+
+def get_image(image_name):
+        """
+        (tk.PhotoImage) Get a image file based on capability.
+
+        If a .png doesn't work, default to the .gif image.
+        Each image is only decoded once and shared afterwards.
+        """
+        image = _images.get(image_name)
+        if image is None:
+            try:
+                image = tk.PhotoImage(file=image_name + ".png")
+            except tk.TclError:
+                image = tk.PhotoImage(file=image_name + ".gif")
+            _images[image_name] = image
+        return image
+
+def _read_images(image_names, ready):
+    '''
+    Read the image files on a background thread and hand them to the Tk thread.
+
+    Parameters:
+        image_names(tuple<string>):The image paths without suffix.
+        ready(queue.Queue):Receives (name, base64 data) pairs, then None.
+    '''
+    for image_name in image_names:
+        for suffix in ('.png', '.gif'):
+            try:
+                with open(image_name + suffix, 'rb') as image_file:
+                    ready.put((image_name, base64.b64encode(image_file.read())))
+                break
+            except OSError:
+                continue
+    ready.put(None)
+
+def preload_images(master, image_names = LATER_IMAGES, done = None):
+    '''
+    Load images in the background after the first frame is shown.
+
+    Files are read on a worker thread, while the decoding into tk.PhotoImage
+    happens a few images at a time on the Tk thread, which owns them.
+
+    Parameters:
+        master(tk.Widget):Widget used to schedule the decoding.
+        image_names(tuple<string>):The image paths without suffix.
+        done(callable):Called once every image is ready.
+    '''
+    ready = queue.Queue()
+    threading.Thread(target = _read_images, args = (image_names, ready), daemon = True).start()
+
+    def install():
+        for _ in range(4):
+            try:
+                item = ready.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                if done is not None:
+                    done()
+                return
+            image_name, data = item
+            if image_name not in _images:
+                try:
+                    _images[image_name] = tk.PhotoImage(master = master, data = data)
+                except tk.TclError:
+                    # leave it to get_image, which falls back to the .gif file.
+                    pass
+        master.after(10, install)
+
+    master.after(10, install)
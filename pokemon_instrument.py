@@ -0,0 +1,206 @@
+"""
+Opt-in latency recording for the stages of a click.
+
+Set POKEMON_PROFILE to a file name (or to 1 for pokemon_profile.json) to
+record from startup, or switch it on from the game menu. Timings go into
+log-scale histograms, so recording costs a few dict operations per stage,
+and the results are written as JSON when the game exits.
+"""
+
+import atexit,json,math,os,time
+
+DEFAULT_PROFILE = 'pokemon_profile.json'
+# Bucket width of the histograms: 8 buckets per doubling, about 9% apart.
+BUCKETS_PER_OCTAVE = 8
+
+
+class LatencyHistogram:
+    '''
+    Count durations in log-scale buckets.
+    '''
+    __slots__ = ('_buckets', 'count', 'total', 'max')
+
+    def __init__(self):
+        self._buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        '''
+        Add one duration.
+
+        Parameters:
+            seconds (float): The duration to count.
+        '''
+        nanoseconds = seconds * 1e9
+        bucket = int(math.log2(nanoseconds) * BUCKETS_PER_OCTAVE) if nanoseconds > 1 else 0
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        '''
+        Returns the upper edge, in seconds, of the bucket holding the given fraction of durations.
+
+        Parameters:
+            fraction (float): Between 0 and 1, 0.99 for p99.
+        '''
+        if not self.count:
+            return 0.0
+        wanted = fraction * self.count
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= wanted:
+                return min(self.max, 2 ** ((bucket + 1) / BUCKETS_PER_OCTAVE) / 1e9)
+        return self.max
+
+    def summary(self):
+        '''
+        Returns (dict): count, mean, p50, p90, p99 and max in milliseconds.
+        '''
+        return {'count': self.count,
+                'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+                'p50_ms': self.percentile(0.5) * 1000,
+                'p90_ms': self.percentile(0.9) * 1000,
+                'p99_ms': self.percentile(0.99) * 1000,
+                'max_ms': self.max * 1000}
+
+
+class _Measure:
+    '''
+    Context manager recording the time spent in its block.
+    '''
+    __slots__ = ('_instrumentation', '_stage', '_start')
+
+    def __init__(self, instrumentation, stage):
+        self._instrumentation = instrumentation
+        self._stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self._instrumentation.record(self._stage, time.perf_counter() - self._start)
+
+
+class _NoMeasure:
+    '''
+    Context manager used while recording is off.
+    '''
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+_NO_MEASURE = _NoMeasure()
+
+
+class Instrumentation:
+    '''
+    Per-stage latency histograms and canvas item counts.
+    '''
+    def __init__(self):
+        self.enabled = False
+        self._path = None
+        self._histograms = {}
+        self._canvas_items = 0
+        self._max_canvas_items = 0
+        self._registered = False
+
+    def enable(self, path = DEFAULT_PROFILE):
+        '''
+        Start recording and write the results to path when the program exits.
+
+        Parameters:
+            path (str): The JSON file to write.
+        '''
+        self.enabled = True
+        self._path = path
+        if not self._registered:
+            atexit.register(self.dump)
+            self._registered = True
+
+    def disable(self):
+        '''
+        Stop recording, keeping what was recorded so far.
+        '''
+        self.enabled = False
+
+    def measure(self, stage):
+        '''
+        Returns a context manager which records the time spent in its block.
+
+        Parameters:
+            stage (str): The name of the stage, e.g. 'draw_board'.
+        '''
+        if self.enabled:
+            return _Measure(self, stage)
+        return _NO_MEASURE
+
+    def record(self, stage, seconds):
+        '''
+        Add a duration to the histogram of a stage.
+        '''
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            histogram = self._histograms[stage] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def record_canvas_items(self, count):
+        '''
+        Remember the number of items on the board canvas.
+        '''
+        self._canvas_items = count
+        if count > self._max_canvas_items:
+            self._max_canvas_items = count
+
+    def report(self):
+        '''
+        Returns (dict): The summary of every stage and the canvas item counts.
+        '''
+        return {'stages': {stage: histogram.summary()
+                           for stage, histogram in sorted(self._histograms.items())},
+                'canvas_items': self._canvas_items,
+                'max_canvas_items': self._max_canvas_items}
+
+    def overlay_text(self, stages):
+        '''
+        Returns one line per stage with its p50 and p99, for the live overlay.
+
+        Parameters:
+            stages (tuple<str>): The stages to show, in order.
+        '''
+        lines = []
+        for stage in stages:
+            histogram = self._histograms.get(stage)
+            if histogram is not None:
+                lines.append(f'{stage:<16}p50 {histogram.percentile(0.5) * 1000:7.2f} ms'
+                             f'  p99 {histogram.percentile(0.99) * 1000:7.2f} ms')
+        lines.append(f'canvas items    {self._canvas_items}')
+        return '\n'.join(lines)
+
+    def dump(self, path = None):
+        '''
+        Write the report as JSON, if anything was recorded.
+
+        Parameters:
+            path (str): The file to write, the one given to enable() by default.
+        '''
+        path = path or self._path
+        if path and self._histograms:
+            with open(path, 'w') as profile:
+                json.dump(self.report(), profile, indent = 1)
+
+
+instrumentation = Instrumentation()
+
+if os.environ.get('POKEMON_PROFILE'):
+    instrumentation.enable(DEFAULT_PROFILE if os.environ['POKEMON_PROFILE'] == '1'
+                           else os.environ['POKEMON_PROFILE'])
@@ -0,0 +1,406 @@
+#author: YI DING
+#email: dydifferent@gmail.com
+#The University of Queensland
+#May 2020
+
+import random
+
+from pokemon_solver import generate_no_guess
+
+UNEXPOSED = "~"
+POKEMON = "☺"
+FLAG = "♥"
+UP = "up"
+DOWN = "down"
+LEFT = "left"
+RIGHT = "right"
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT,
+              f"{UP}-{LEFT}", f"{UP}-{RIGHT}",
+              f"{DOWN}-{LEFT}", f"{DOWN}-{RIGHT}")
+# The number of pokemon sprites a caught pokemon can be drawn with.
+POKEMON_KINDS = 6
+PLAYING = 'playing'
+WON = 'won'
+LOST = 'lost'
+
+
+class BoardModel:
+    '''
+    Store and manage the internal game state.
+    '''
+    def __init__(self, grid_size, num_pokemon, no_guess = False, time_budget = 1.0):
+        """
+        Construct a covered or uncovered board
+
+        parameters:
+            grid_size (int):The grid size of the game.
+            num_pokemon (int): The number of pokemons that the game will have.
+            no_guess (bool): Place the pokemons so the board can be solved
+                from get_safe_start() without guessing.
+            time_budget (float): Seconds the no-guess placement may take.
+        """
+        self._grid_size = grid_size
+        self._num_pokemon = num_pokemon
+        self._board = UNEXPOSED*(self._grid_size ** 2) 
+        self._pokemon_locations = ()
+        self._pokemon_set = frozenset()
+        self._pokemon_sprites = bytearray()
+        self._attempted_catches_num = 0
+        self._safe_start = None
+        if no_guess:
+            self.generate_no_guess_pokemons(time_budget)
+        else:
+            self.generate_pokemons(grid_size, num_pokemon)
+
+    def get_game(self): 
+        '''
+        Returns an appropriate representation of the current state of the game board.
+        '''
+        return self._board
+
+    def get_cell(self, index):
+        '''
+        Returns the character of the game string at index.
+        '''
+        return self._board[index]
+
+    def get_state(self):
+        '''
+        Returns LOST once a pokemon is revealed, WON once every cell is revealed
+        or flagged with a pokeball on each pokemon, PLAYING otherwise.
+        '''
+        if POKEMON in self._board:
+            return LOST
+        if UNEXPOSED not in self._board and self._board.count(FLAG) == len(self._pokemon_locations):
+            return WON
+        return PLAYING
+
+    def generate_pokemons(self, grid_size, num_pokemon):
+        """Pokemons will be generated and given a random index within the game.
+
+        Parameters:
+            grid_size (int): The grid size of the game.
+            num_pokemon (int): The number of pokemons that the game will have.
+
+        Returns:
+            (tuple<int>): A tuple containing  indexes where the pokemons are
+            created for the game string.
+        """
+        square_count = self._grid_size ** 2 
+        locations = list(self._pokemon_locations)
+        taken = set(locations)
+        for i in range(self._num_pokemon):
+            if len(locations) >= square_count:
+                break
+            index = random.randint(0, square_count-1)
+            while index in taken:
+                index = random.randint(0, square_count-1)
+            locations.append(index)
+            taken.add(index)
+        self.set_pokemon_locations(locations)
+
+    def generate_no_guess_pokemons(self, time_budget = 1.0):
+        """
+        Place the pokemons so the board can be cleared from the middle cell by
+        deduction alone. If the time budget runs out the pokemons are placed
+        by generate_pokemons instead, and get_safe_start() returns None.
+
+        Parameters:
+            time_budget (float): Seconds the placement may take.
+        """
+        start = self._grid_size // 2 * (self._grid_size + 1)
+        locations = generate_no_guess(self._grid_size, min(self._num_pokemon, self._grid_size ** 2),
+                                      start, time_budget)
+        if locations is None:
+            self.generate_pokemons(self._grid_size, self._num_pokemon)
+        else:
+            self.set_pokemon_locations(locations)
+            self._safe_start = start
+
+    def get_safe_start(self):
+        '''
+        Returns the cell to open a no-guess board from, or None for a random board.
+        '''
+        return self._safe_start
+
+    def get_pokemon_locations(self):
+        '''
+        Returns the indices describing all pokemon locations.
+        '''
+        return self._pokemon_locations
+
+    def set_pokemon_locations(self, pokemon_locations, sprites = None):
+        '''
+        Place the pokemons at the given indices, e.g. when a game is loaded.
+
+        Each pokemon keeps one sprite for the whole game, stored one byte
+        per cell so it can be looked up by index.
+
+        Parameters:
+            pokemon_locations (iterable<int>): The indices of the pokemons.
+            sprites (list<int>): The sprite of each pokemon, in the same order,
+                picked at random if not given.
+        '''
+        self._pokemon_locations = tuple(pokemon_locations)
+        self._pokemon_set = frozenset(self._pokemon_locations)
+        if sprites is None:
+            sprites = random.choices(range(POKEMON_KINDS), k = len(self._pokemon_locations))
+        self._pokemon_sprites = bytearray(self._grid_size ** 2)
+        for index, sprite in zip(self._pokemon_locations, sprites):
+            self._pokemon_sprites[index] = sprite
+        # a safe start only holds for the placement it was generated with.
+        self._safe_start = None
+
+    def get_pokemon_sprite(self, index):
+        '''
+        Returns the sprite number, below POKEMON_KINDS, of the pokemon at index.
+        '''
+        return self._pokemon_sprites[index]
+
+    def get_pokemon_sprites(self):
+        '''
+        Returns the sprite numbers of the pokemons, in the order of get_pokemon_locations().
+        '''
+        return [self._pokemon_sprites[index] for index in self._pokemon_locations]
+
+    def get_num_attempted_catches(self):
+        '''
+        Returns the number of pokeballs currently placed on the board.
+        '''
+        return self._attempted_catches_num 
+
+
+    def get_num_pokeball_leave(self):
+        '''
+        Return the number of left pokeballs
+        '''
+        leave_ball = self._num_pokemon - self.get_num_attempted_catches()
+        if leave_ball < 0:
+            return 0 
+        else:
+            return leave_ball
+        
+    def get_grid_size(self):
+        '''
+        Returns the grid size of the game.
+        '''
+        return self._grid_size
+
+    def get_num_pokemon(self):
+        '''
+        Returns the number of pokemon hidden in the game.
+        '''
+        return self._num_pokemon
+
+    def position_to_index(self, position, grid_size):
+        """
+        Convert the row, column coordinate in the grid to the game strings index.
+
+        Parameters:
+            position (tuple<int, int>): The row, column position of a cell.
+            grid_size (int): The grid size of the game.
+
+        Returns:
+            (int): The index of the cell in the game string.
+        """
+        x, y = position
+        return x + y * self._grid_size 
+
+    def flag_cell(self, index):
+        """
+        Toggle Flag on or off at selected index. If the selected index is already
+        revealed, the game would return with no changes.
+
+            Parameters:
+                index (int): The index in the game string where a flag is placed.
+            Returns
+                (str): The updated game string.
+        """
+        if self._board[index] == FLAG:
+            self._board = self.replace_character_at_index(index, UNEXPOSED)
+            self._attempted_catches_num -= 1
+
+        elif self._board[index] == UNEXPOSED:
+            if self.get_num_pokeball_leave() == 0:
+                return None
+            else:
+                self._board = self.replace_character_at_index(index, FLAG)
+                self._attempted_catches_num += 1
+
+        return self._board
+
+    def replace_character_at_index(self, index, character):
+        """
+        A specified index in the game string at the specified index is replaced by
+        a new character.
+        Parameters:
+            index (int): The index in the game string where the character is replaced.
+            character (str): The new character that will be replacing the old character.
+
+        Returns:
+            (str): The updated game string.
+        """
+        self._board = self._board[:index] + character + self._board[index + 1:]
+        return self._board
+
+    def index_in_direction(self, index, grid_size, direction):
+        """
+        The index in the game string is updated by determining the
+        adjacent cell given the direction.
+        The index of the adjacent cell in the game is then calculated and returned.
+
+        The index of m is 4 in the game string.
+        if the direction specified is "up" then:
+        the updated position corresponds with j which has the index of 1 in the game string.
+
+        Parameters:
+            index (int): The index in the game string.
+            grid_size (int): The grid size of the game.
+            direction (str): The direction of the adjacent cell.
+
+        Returns:
+            (int): The index in the game string corresponding to the new cell position
+            in the game.
+
+            None for invalid direction.
+        """
+        row = index % self._grid_size
+        col = index // self._grid_size
+        if RIGHT in direction:
+            col += 1
+        elif LEFT in direction:
+            col -= 1
+        if UP in direction:
+            row -= 1
+        elif DOWN in direction:
+            row += 1
+        if not (0 <= col < self._grid_size and 0 <= row < self._grid_size):
+            return None
+        return self.position_to_index((row, col), self._grid_size)
+
+    def neighbour_directions(self, index, grid_size):
+        """
+        Seek out all direction that has a neighbouring cell.
+
+        Parameters:
+            index (int): The index in the game string.
+            grid_size (int): The grid size of the game.
+
+        Returns:
+            (list<int>): A list of index that has a neighbouring cell.
+        """
+        neighbours = []
+        for direction in DIRECTIONS:
+            neighbour = self.index_in_direction(index, grid_size, direction)
+            if neighbour is not None:
+                neighbours.append(neighbour)
+        return neighbours
+
+    def number_at_cell(self, pokemon_locations, grid_size, index):
+        """
+        Calculates what number should be displayed at that specific index in the game.
+
+        Parameters:
+            pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+            grid_size (int): Size of game.
+            index (int): Index of the currently selected cell
+
+        Returns:
+            (int): Number to be displayed at the given index in the game string.
+        """
+        if self._board[index] != UNEXPOSED:
+            return int(self._board[index])
+        if pokemon_locations is self._pokemon_locations:
+            # look the board's own pokemons up in a set rather than the tuple.
+            pokemon_locations = self._pokemon_set
+        number = 0
+        for neighbour in self.neighbour_directions(index, grid_size):
+            if neighbour in pokemon_locations:
+                number += 1
+        return number
+
+    def big_fun_search(self, grid_size, pokemon_locations, index):
+        """
+        Searching adjacent cells to see if there are any Pokemon"s present.
+
+        Using some sick algorithms.
+
+        Find all cells which should be revealed when a cell is selected.
+
+        For cells which have a zero value (i.e. no neighbouring pokemons) all the cell"s
+        neighbours are revealed. If one of the neighbouring cells is also zero then
+        all of that cell"s neighbours are also revealed. This repeats until no
+        zero value neighbours exist.
+
+        For cells which have a non-zero value (i.e. cells with neighbour pokemons), only
+        the cell itself is revealed.
+
+        Parameters:
+            grid_size (int): Size of game.
+            pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+            index (int): Index of the currently selected cell
+
+        Returns:
+            (list<int>): List of cells to turn visible.
+        """
+        queue = [index]
+        discovered = {index}
+        visible = []
+        if self._board[index] == FLAG:
+            return queue
+        number = self.number_at_cell(pokemon_locations, grid_size, index)
+        if number != 0:
+            return queue
+        while queue:
+            node = queue.pop()
+            for neighbour in self.neighbour_directions(node, grid_size):
+                if neighbour in discovered:
+                    continue
+                discovered.add(neighbour)
+                if self._board[neighbour] != FLAG:
+                    number = self.number_at_cell(pokemon_locations, grid_size, neighbour)
+                    if number == 0:
+                        queue.append(neighbour)
+                visible.append(neighbour)
+        return visible
+
+    def reveal_cells(self, grid_size, pokemon_locations, index):
+        """
+        Reveals all neighbouring square boards at index and repeats for all
+        square boards that had a 0.
+
+        Parameters:
+            pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+            grid_size (int): Size of game.
+            index (int): Index of the currently selected cell.
+
+        Returns:
+            (str): The updated game string.
+        """
+        self.reveal_indexes(grid_size, pokemon_locations, index)
+        return self._board
+
+    def reveal_indexes(self, grid_size, pokemon_locations, index):
+        """
+        Reveal the cells like reveal_cells, but report which cells were revealed.
+
+        Parameters:
+            grid_size (int): Size of game.
+            pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+            index (int): Index of the currently selected cell.
+
+        Returns:
+            (list<int>): The indexes whose character was set.
+        """
+        number = self.number_at_cell(pokemon_locations, grid_size, index)
+        self._board = self.replace_character_at_index(index, str(number))
+        revealed = [index]
+        clear = self.big_fun_search(grid_size, pokemon_locations, index)
+        # write the revealed cells in one pass instead of copying the string per cell.
+        board = list(self._board)
+        for i in clear:
+            if board[i] == UNEXPOSED:
+                board[i] = str(self.number_at_cell(pokemon_locations, grid_size, i))
+                revealed.append(i)
+        self._board = ''.join(board)
+        return revealed
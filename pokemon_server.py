@@ -0,0 +1,385 @@
+"""
+Host many pokemon games at once over TCP or Unix sockets.
+
+Every message is one line of JSON. A client may run several sessions on one
+connection, and every reply echoes the "id" of the request it answers.
+
+    {"op": "new", "grid_size": 10, "num_pokemon": 15, "no_guess": false}
+        -> {"op": "new", "session": 1, "grid_size": 10, "num_pokemon": 15, "start": null}
+    {"op": "reveal", "session": 1, "index": 42}
+    {"op": "flag", "session": 1, "index": 42}
+        -> {"op": "reveal", "session": 1, "cells": [[42, "0"], [43, "1"]], "state": "playing"}
+    {"op": "board", "session": 1}
+        -> {"op": "board", "session": 1, "board": "~~1~...", "state": "playing"}
+    {"op": "close", "session": 1}
+        -> {"op": "close", "session": 1}
+
+With "no_guess" the board can be solved from the cell in "start" without
+guessing; "start" stays null if the placement ran out of time. No-guess
+boards are placed in worker processes, so placing them does not hold up the
+other sessions, and their reply may come after replies to later requests.
+
+Moves only send back the cells which changed. Each session queues at most
+max_pending moves; more moves are answered with {"error": "busy"} until the
+session catches up, without holding up the other sessions on the connection.
+Moves still queued when their session closes are answered with
+{"error": "closed"}.
+"""
+
+import argparse,asyncio,collections,concurrent.futures,json,random
+
+from pokemon_compact import CompactBoard
+from pokemon_solver import generate_no_guess
+from pokemon_engine import reveal_move, flag_move, game_state, PLAYING
+
+MOVES = {'reveal': reveal_move, 'flag': flag_move}
+
+
+class Session:
+    '''
+    One game hosted by the server.
+
+    The queue of moves only exists while the session has moves waiting.
+    '''
+    __slots__ = ('session_id', 'model', 'writer', 'pending', 'worker')
+
+    def __init__(self, session_id, model, writer):
+        '''
+        Parameters:
+            session_id (int): The id the client uses for the game.
+            model (CompactBoard): The board of the game.
+            writer (asyncio.StreamWriter): Where the replies of the game go.
+        '''
+        self.session_id = session_id
+        self.model = model
+        self.writer = writer
+        self.pending = None
+        self.worker = None
+
+
+class GameServer:
+    '''
+    Run pokemon game sessions for the connected clients.
+    '''
+    def __init__(self, max_sessions = 100000, max_pending = 8, max_grid_size = 50,
+                 no_guess_budget = 0.25, max_no_guess_grid_size = 50, no_guess_workers = 2):
+        '''
+        Parameters:
+            max_sessions (int): The number of sessions the server hosts at most.
+            max_pending (int): The number of queued moves a session may have.
+            max_grid_size (int): The biggest grid size a client may ask for.
+                A move runs on the event loop, and a flood on an empty grid of
+                50 takes about 25 ms, so bigger grids hold up every session.
+            no_guess_budget (float): Seconds a no-guess board may take to place.
+            max_no_guess_grid_size (int): The biggest grid size a no-guess
+                board may have; bigger boards rarely place within the budget.
+            no_guess_workers (int): The number of processes placing no-guess boards.
+        '''
+        self._no_guess_budget = no_guess_budget
+        self._max_no_guess_grid_size = max_no_guess_grid_size
+        self._no_guess_workers = no_guess_workers
+        self._placer = None
+        self._max_sessions = max_sessions
+        self._max_pending = max_pending
+        self._max_grid_size = max_grid_size
+        self._sessions = {}
+        self._next_session = 0
+        self._drain_locks = {}
+
+    def close(self):
+        '''
+        Stop the worker processes placing no-guess boards.
+        '''
+        if self._placer is not None:
+            self._placer.shutdown(wait = False)
+            self._placer = None
+
+    def get_num_sessions(self):
+        '''
+        Returns the number of live sessions.
+        '''
+        return len(self._sessions)
+
+    async def handle_connection(self, reader, writer):
+        '''
+        Serve the requests of one client until it disconnects.
+
+        Parameters:
+            reader (asyncio.StreamReader): The incoming side of the connection.
+            writer (asyncio.StreamWriter): The outgoing side of the connection.
+        '''
+        owned = set()
+        self._drain_locks[writer] = asyncio.Lock()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    self.send(writer, {'error': 'bad request'})
+                    continue
+                if not isinstance(request, dict):
+                    self.send(writer, {'error': 'bad request'})
+                    continue
+                self.dispatch(request, writer, owned)
+                await self.drain(writer)
+        except ConnectionError:
+            pass
+        finally:
+            for session_id in owned:
+                self.close_session(session_id)
+            del self._drain_locks[writer]
+            writer.close()
+
+    async def drain(self, writer):
+        '''
+        Wait until the connection takes more replies.
+
+        The sessions of a connection share its writer, and before Python 3.10
+        drain() only allows one waiter at a time, so they take turns.
+
+        Parameters:
+            writer (asyncio.StreamWriter): The connection to wait for.
+        '''
+        lock = self._drain_locks.get(writer)
+        if lock is None:
+            raise ConnectionError('connection closed')
+        async with lock:
+            await writer.drain()
+
+    def dispatch(self, request, writer, owned):
+        '''
+        Answer a request, or queue it on its session if it is a move.
+
+        Parameters:
+            request (dict): The decoded request.
+            writer (asyncio.StreamWriter): The connection the request came from.
+            owned (set<int>): The sessions opened by this connection.
+        '''
+        op = request.get('op')
+        if not isinstance(op, str):
+            self.send(writer, {'error': 'bad request'}, request)
+            return
+        if op == 'new':
+            if request.get('no_guess'):
+                asyncio.ensure_future(self.new_no_guess_session(request, writer, owned))
+            else:
+                self.send(writer, self.new_session(request, writer, owned), request)
+            return
+        session_id = request.get('session')
+        if type(session_id) is not int:
+            self.send(writer, {'op': op, 'error': 'bad request'}, request)
+            return
+        session = self._sessions.get(session_id)
+        if session is None or session.session_id not in owned:
+            self.send(writer, {'op': op, 'error': 'unknown session'}, request)
+        elif op in MOVES:
+            if session.pending is None:
+                session.pending = collections.deque()
+            elif len(session.pending) >= self._max_pending:
+                self.send(writer, {'op': op, 'session': session.session_id, 'error': 'busy'}, request)
+                return
+            session.pending.append(request)
+            if session.worker is None:
+                session.worker = asyncio.ensure_future(self.run_session(session))
+        elif op == 'board':
+            model = session.model
+            self.send(writer, {'op': op, 'session': session.session_id,
+                               'board': model.get_game(), 'state': game_state(model)}, request)
+        elif op == 'close':
+            owned.discard(session.session_id)
+            self.close_session(session.session_id)
+            self.send(writer, {'op': op, 'session': session.session_id}, request)
+        else:
+            self.send(writer, {'op': op, 'error': 'unknown op'}, request)
+
+    def check_new(self, request):
+        '''
+        Returns the error reply to a "new" request, or None if it can be served.
+
+        Parameters:
+            request (dict): The "new" request.
+        '''
+        grid_size = request.get('grid_size', 10)
+        num_pokemon = request.get('num_pokemon', 15)
+        max_grid_size = self._max_no_guess_grid_size if request.get('no_guess') else self._max_grid_size
+        # type() rather than isinstance(), as JSON true and false are bools, which are ints.
+        if not (type(grid_size) is int and type(num_pokemon) is int
+                and 0 < grid_size <= max_grid_size and 0 <= num_pokemon <= grid_size ** 2):
+            return {'op': 'new', 'error': 'bad board size'}
+        if len(self._sessions) >= self._max_sessions:
+            return {'op': 'new', 'error': 'server full'}
+        return None
+
+    def new_session(self, request, writer, owned, start = None, locations = None):
+        '''
+        Start a new game for the connection.
+
+        Parameters:
+            request (dict): The "new" request.
+            writer (asyncio.StreamWriter): The connection the request came from.
+            owned (set<int>): The sessions opened by this connection.
+            start (int): The cell the board can be solved from without guessing, if any.
+            locations (tuple<int>): The pokemon indexes, random if not given.
+
+        Returns:
+            (dict): The reply to send.
+        '''
+        error = self.check_new(request)
+        if error is not None:
+            return error
+        grid_size = request.get('grid_size', 10)
+        num_pokemon = request.get('num_pokemon', 15)
+        self._next_session += 1
+        session = Session(self._next_session, CompactBoard(grid_size, num_pokemon, locations), writer)
+        self._sessions[session.session_id] = session
+        owned.add(session.session_id)
+        return {'op': 'new', 'session': session.session_id,
+                'grid_size': grid_size, 'num_pokemon': num_pokemon, 'start': start}
+
+    async def new_no_guess_session(self, request, writer, owned):
+        '''
+        Place a no-guess board in a worker process, then start its game.
+
+        Parameters:
+            request (dict): The "new" request.
+            writer (asyncio.StreamWriter): The connection the request came from.
+            owned (set<int>): The sessions opened by this connection.
+        '''
+        reply = self.check_new(request)
+        if reply is None:
+            grid_size = request.get('grid_size', 10)
+            start = grid_size // 2 * (grid_size + 1)
+            if self._placer is None:
+                self._placer = concurrent.futures.ProcessPoolExecutor(self._no_guess_workers)
+            # a seeded generator of its own, as forked workers share the parent's random state.
+            locations = await asyncio.get_running_loop().run_in_executor(
+                self._placer, generate_no_guess, grid_size, request.get('num_pokemon', 15),
+                start, self._no_guess_budget, random.Random())
+            if writer not in self._drain_locks:
+                # the connection closed while the board was placed.
+                return
+            reply = self.new_session(request, writer, owned,
+                                     None if locations is None else start, locations)
+        self.send(writer, reply, request)
+
+    def close_session(self, session_id):
+        '''
+        Forget a session, answering its queued moves with {"error": "closed"}.
+
+        Parameters:
+            session_id (int): The session to close.
+        '''
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            for request in session.pending or ():
+                self.send(session.writer, {'op': request['op'], 'session': session_id, 'error': 'closed'}, request)
+            session.pending = None
+            if session.worker is not None:
+                session.worker.cancel()
+                session.worker = None
+
+    async def run_session(self, session):
+        '''
+        Play the queued moves of a session in order and send their deltas.
+
+        Parameters:
+            session (Session): The session with queued moves.
+        '''
+        try:
+            while session.pending:
+                request = session.pending.popleft()
+                self.send(session.writer, self.play(session, request), request)
+                await self.drain(session.writer)
+        except ConnectionError:
+            pass
+        finally:
+            session.pending = None
+            session.worker = None
+
+    def play(self, session, request):
+        '''
+        Apply one move to a session.
+
+        Parameters:
+            session (Session): The session to play on.
+            request (dict): The "reveal" or "flag" request.
+
+        Returns:
+            (dict): The reply with the changed cells and the game state.
+        '''
+        op = request['op']
+        model = session.model
+        index = request.get('index')
+        if not (type(index) is int and 0 <= index < model.get_grid_size() ** 2):
+            return {'op': op, 'session': session.session_id, 'error': 'bad index'}
+        if game_state(model) != PLAYING:
+            return {'op': op, 'session': session.session_id, 'error': 'game over'}
+        changed = MOVES[op](model, index)
+        return {'op': op, 'session': session.session_id,
+                'cells': [[i, model.get_cell(i)] for i in changed], 'state': game_state(model)}
+
+    def send(self, writer, reply, request = None):
+        '''
+        Write one reply line, echoing the id of the request it answers.
+
+        Parameters:
+            writer (asyncio.StreamWriter): The connection to write to.
+            reply (dict): The reply to send.
+            request (dict): The request being answered, if any.
+        '''
+        if request is not None and 'id' in request:
+            reply['id'] = request['id']
+        if not writer.is_closing():
+            writer.write(json.dumps(reply, separators = (',', ':')).encode() + b'\n')
+
+
+async def start_server(game_server, host = '127.0.0.1', port = 8765, unix = None):
+    '''
+    Listen for clients of the game server.
+
+    Parameters:
+        game_server (GameServer): The server which hosts the sessions.
+        host (str): The address to listen on.
+        port (int): The TCP port to listen on, 0 for any free port.
+        unix (str): A Unix socket path to listen on instead of TCP.
+
+    Returns:
+        (asyncio.Server): The listening server.
+    '''
+    if unix:
+        return await asyncio.start_unix_server(game_server.handle_connection, path = unix)
+    return await asyncio.start_server(game_server.handle_connection, host, port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Host pokemon games over sockets.')
+    parser.add_argument('--host', default = '127.0.0.1')
+    parser.add_argument('--port', type = int, default = 8765)
+    parser.add_argument('--unix', help = 'listen on this Unix socket path instead of TCP')
+    parser.add_argument('--max-sessions', type = int, default = 100000)
+    parser.add_argument('--max-pending', type = int, default = 8)
+    parser.add_argument('--max-grid-size', type = int, default = 50)
+    args = parser.parse_args()
+
+    async def serve():
+        game_server = GameServer(args.max_sessions, args.max_pending, args.max_grid_size)
+        server = await start_server(game_server, args.host, args.port, args.unix)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            game_server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
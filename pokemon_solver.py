@@ -0,0 +1,274 @@
+"""
+No-guess board generation.
+
+generate_no_guess places the pokemons, then plays the board from a safe start
+with solve(), a constraint propagation solver which never guesses. When the
+solver gets stuck, a pokemon next to the stuck area is moved to a cell the
+solver has not revealed and which is not next to the stuck area, and the
+board is solved again, instead of throwing the whole placement away.
+
+Run this module to print the generation throughput per grid size and density.
+"""
+
+import argparse,random,time
+
+UNKNOWN = 0
+SAFE = 1
+KNOWN_POKEMON = 2
+
+
+def neighbours(grid_size, index):
+    '''
+    Returns the indexes of the up to eight cells around index.
+    '''
+    x, y = index % grid_size, index // grid_size
+    if 0 < x < grid_size - 1 and 0 < y < grid_size - 1:
+        above, below = index - grid_size, index + grid_size
+        return [above - 1, above, above + 1, index - 1, index + 1, below - 1, below, below + 1]
+    return [nx + ny * grid_size
+            for ny in range(max(0, y - 1), min(grid_size, y + 2))
+            for nx in range(max(0, x - 1), min(grid_size, x + 2))
+            if nx != x or ny != y]
+
+
+def solve(grid_size, pokemon_locations, start, deadline = None):
+    """
+    Play the board from start using only deductions.
+
+    Three rules are applied until none makes progress: a number whose
+    pokemons are all found clears its other neighbours, a number with as
+    many unknown neighbours as pokemons left marks them all, and when the
+    unknown neighbours of one number are a subset of another's the
+    difference is cleared or marked. Finally the total pokemon count is
+    used once nothing else applies.
+
+    Parameters:
+        grid_size (int): The grid size of the game.
+        pokemon_locations (set<int>): The indexes of the pokemons.
+        start (int): The first cell revealed, which must be safe.
+        deadline (float): The time.perf_counter() value to give up at, if any.
+
+    Returns:
+        (tuple<bool, set<int>, bytearray>): Whether every safe cell was
+        revealed, the unknown cells next to revealed numbers where the solver
+        stopped, and the UNKNOWN, SAFE or KNOWN_POKEMON state of every cell;
+        None if the deadline passed first.
+    """
+    square_count = grid_size ** 2
+    state = bytearray(square_count)
+    safe_total = square_count - len(pokemon_locations)
+    # revealed numbers with unknown cells around them, and those cells' neighbours.
+    frontier = {}
+    numbers = {}
+    revealed = 0
+    found = 0
+    timed_out = False
+
+    def expired():
+        nonlocal timed_out
+        if deadline is not None and time.perf_counter() > deadline:
+            timed_out = True
+        return timed_out
+
+    def reveal(index):
+        nonlocal revealed
+        stack = [index]
+        while stack and not timed_out:
+            cell = stack.pop()
+            if state[cell] != UNKNOWN:
+                continue
+            state[cell] = SAFE
+            revealed += 1
+            if not revealed % 4096:
+                # a flood can cover the whole board, so it watches the time too.
+                expired()
+            around = neighbours(grid_size, cell)
+            number = sum(1 for neighbour in around if neighbour in pokemon_locations)
+            if number == 0:
+                stack.extend(neighbour for neighbour in around if state[neighbour] == UNKNOWN)
+            else:
+                numbers[cell] = number
+                frontier[cell] = around
+
+    def mark(index):
+        nonlocal found
+        if state[index] == UNKNOWN:
+            state[index] = KNOWN_POKEMON
+            found += 1
+
+    reveal(start)
+    while revealed < safe_total:
+        if expired():
+            return None
+        constraints = {}
+        progress = False
+        for cell, around in list(frontier.items()):
+            unknown = [neighbour for neighbour in around if state[neighbour] == UNKNOWN]
+            if not unknown:
+                del frontier[cell]
+                continue
+            left = numbers[cell] - sum(1 for neighbour in around if state[neighbour] == KNOWN_POKEMON)
+            if left == 0:
+                for neighbour in unknown:
+                    reveal(neighbour)
+                progress = True
+            elif left == len(unknown):
+                for neighbour in unknown:
+                    mark(neighbour)
+                progress = True
+            else:
+                constraints[frozenset(unknown)] = left
+        if progress:
+            continue
+        if expired():
+            return None
+        # subset rule between numbers sharing unknown cells
+        by_cell = {}
+        for cells in constraints:
+            for cell in cells:
+                by_cell.setdefault(cell, []).append(cells)
+        for small, small_left in constraints.items():
+            for big in {big for cell in small for big in by_cell[cell]}:
+                if big is small or not small < big:
+                    continue
+                rest = big - small
+                rest_left = constraints[big] - small_left
+                if rest_left == 0:
+                    for cell in rest:
+                        reveal(cell)
+                    progress = True
+                elif rest_left == len(rest):
+                    for cell in rest:
+                        mark(cell)
+                    progress = True
+            if progress:
+                break
+        if progress:
+            continue
+        # global count of the pokemons left
+        unknown = [index for index in range(square_count) if state[index] == UNKNOWN]
+        if found == len(pokemon_locations):
+            for index in unknown:
+                reveal(index)
+            continue
+        if len(pokemon_locations) - found == len(unknown):
+            for index in unknown:
+                mark(index)
+            continue
+        if expired():
+            return None
+        stuck = {neighbour for around in frontier.values() for neighbour in around
+                 if state[neighbour] == UNKNOWN}
+        return False, stuck, state
+    return True, set(), state
+
+
+def generate_no_guess(grid_size, num_pokemon, start, time_budget = 1.0, rng = random):
+    """
+    Place pokemons so the board can be solved from start without guessing.
+
+    The time budget is checked inside solve(), so the call returns soon
+    after it runs out even on big grids.
+
+    Parameters:
+        grid_size (int): The grid size of the game.
+        num_pokemon (int): The number of pokemons to place.
+        start (int): The first cell the player reveals.
+        time_budget (float): Seconds to spend before giving up.
+        rng (random.Random): Source of randomness.
+
+    Returns:
+        (tuple<int>): The pokemon indexes, or None if the time ran out.
+    """
+    deadline = time.perf_counter() + time_budget
+    square_count = grid_size ** 2
+    opening = {start, *neighbours(grid_size, start)}
+    if num_pokemon > square_count - len(opening):
+        # too crowded to open with a zero, only keep the start itself free.
+        opening = {start}
+    if num_pokemon > square_count - len(opening):
+        return None
+
+    def place():
+        # sampling a few extra cells is cheaper than listing every allowed one.
+        sample = rng.sample(range(square_count), num_pokemon + len(opening))
+        return set([index for index in sample if index not in opening][:num_pokemon])
+
+    pokemons = place()
+    while True:
+        result = solve(grid_size, pokemons, start, deadline)
+        if result is None:
+            return None
+        solved, stuck, state = result
+        if solved:
+            return tuple(pokemons)
+        movable = [index for index in stuck if index in pokemons] or list(pokemons)
+        near = set(stuck)
+        for cell in stuck:
+            near.update(neighbours(grid_size, cell))
+
+        def is_target(index):
+            return (state[index] == UNKNOWN and index not in pokemons
+                    and index not in near and index not in opening)
+
+        target = None
+        for _ in range(64):
+            index = rng.randrange(square_count)
+            if is_target(index):
+                target = index
+                break
+        else:
+            targets = [index for index in range(square_count) if is_target(index)]
+            if targets:
+                target = rng.choice(targets)
+        if target is None:
+            # nowhere to move to, start again from a new placement.
+            pokemons = place()
+            continue
+        pokemons.remove(rng.choice(movable))
+        pokemons.add(target)
+
+
+def measure_throughput(grid_size, density, duration = 1.0, time_budget = 1.0, seed = 0):
+    '''
+    Generate no-guess boards for a while and count them.
+
+    Parameters:
+        grid_size (int): The grid size of the boards.
+        density (float): The share of cells holding a pokemon.
+        duration (float): Seconds to keep generating for.
+        time_budget (float): The budget given to each board.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        (dict): Boards per second and the number of boards which ran out of time.
+    '''
+    rng = random.Random(seed)
+    num_pokemon = int(grid_size ** 2 * density)
+    start = grid_size // 2 * (grid_size + 1)
+    boards = failed = 0
+    began = time.perf_counter()
+    while time.perf_counter() - began < duration:
+        if generate_no_guess(grid_size, num_pokemon, start, time_budget, rng) is None:
+            failed += 1
+        else:
+            boards += 1
+    elapsed = time.perf_counter() - began
+    return {'boards_per_sec': boards / elapsed, 'failed': failed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Report no-guess generation throughput.')
+    parser.add_argument('--sizes', type = int, nargs = '+', default = (10, 16, 30, 50))
+    parser.add_argument('--densities', type = float, nargs = '+', default = (0.12, 0.15, 0.2))
+    parser.add_argument('--duration', type = float, default = 1.0, help = 'seconds per case')
+    parser.add_argument('--budget', type = float, default = 1.0, help = 'seconds per board')
+    args = parser.parse_args()
+    print(f'{"grid":>6}{"density":>9}{"boards/sec":>12}{"failed":>8}')
+    for grid_size in args.sizes:
+        for density in args.densities:
+            result = measure_throughput(grid_size, density, args.duration, args.budget)
+            print(f'{grid_size:>6}{density:>9.2f}{result["boards_per_sec"]:>12.1f}{result["failed"]:>8}')
+
+if __name__ == "__main__":
+    main()